@@ -3,16 +3,61 @@ from flask import request
 
 import os
 import signal
+import threading
 
 import psycopg2
-import conn_params
+from psycopg2 import extensions, pool
 import ml
 
-import pandas as pd
-from sklearn import linear_model
-
 app = Flask(__name__)
 
+# Database connections are pooled and reused across requests. The pool is created on first use, so importing
+# this module does not touch the database. minconn equals maxconn because psycopg2 only keeps a returned
+# connection open while the pool holds fewer than minconn idle ones, and closes it otherwise.
+DB_POOL_SIZE = 5
+db_pool = None
+db_pool_lock = threading.Lock()
+
+# ThreadedConnectionPool raises PoolError instead of waiting when every connection is in use,
+# so requests beyond DB_POOL_SIZE wait here for a free connection
+db_pool_slots = threading.BoundedSemaphore(DB_POOL_SIZE)
+
+def get_db_pool():
+    global db_pool
+    with db_pool_lock:
+        if db_pool is None:
+            db_pool = pool.ThreadedConnectionPool(DB_POOL_SIZE, DB_POOL_SIZE, ml.conn_string)
+    return db_pool
+
+def get_db_conn():
+    db_pool_slots.acquire()
+    try:
+        # Hand out a live connection. Ones already known to be dead are dropped without a round trip, the others
+        # are pinged in case the server closed them (restart, idle timeout, ...). Every idle connection may be
+        # stale, so try each of them plus one newly opened connection before giving up.
+        for attempt in range(DB_POOL_SIZE + 1):
+            conn = get_db_pool().getconn()
+            if not conn.closed and conn.info.transaction_status == extensions.TRANSACTION_STATUS_IDLE:
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                    conn.rollback()
+                    return conn
+                except psycopg2.Error:
+                    pass
+            db_pool.putconn(conn, close=True)
+        raise psycopg2.OperationalError("Could not get a working connection from the pool")
+    except Exception:
+        db_pool_slots.release()
+        raise
+
+def put_db_conn(conn):
+    # Hand the connection back to the pool rather than closing it
+    try:
+        db_pool.putconn(conn)
+    finally:
+        db_pool_slots.release()
+
 @app.route("/")
 def hello():
     return "Hello World! This is a test from flask_test.py"
@@ -31,27 +76,31 @@ def trey():
 
 @app.route("/_ml")
 def _ml():
-    result = ml.linearReg()
+    # The connection (and its pool slot) is held for the whole run: loading the data, fitting the model and
+    # writing the predictions. Other requests wait for a free slot meanwhile, they do not fail.
+    conn = get_db_conn()
+    try:
+        result = ml.linearReg(conn)
+    finally:
+        put_db_conn(conn)
     return result
 
 @app.route("/db")
 def db():
-    # Connect to PostgreSQL, all the connection parameters are stored in a separate file "conn_params.py":
-    conn_string = "host=" + conn_params.HOST \
-                  + " port=" + conn_params.PORT \
-                  + " dbname=" + conn_params.DATABASE \
-                  + " user=" + conn_params.USER \
-                  + " password=" + conn_params.PASSWORD
-
+    # Get a connection to PostgreSQL from the pool
     try:
-        conn = psycopg2.connect(conn_string)
+        conn = get_db_conn()
         result = "Connection Successful"
     except Exception as e:
-        result = "Connection Not Successful"
+        return "Connection Not Successful"
 
-    db_data = pd.read_sql_query('select * from public.heat_demand_info();', conn)
-
-    conn.close()
+    try:
+        # Only check that the data can be queried; fetching the whole result set is not needed
+        with conn.cursor() as cur:
+            cur.execute('select 1 from public.heat_demand_info() limit 1;')
+            cur.fetchone()
+    finally:
+        put_db_conn(conn)
 
     return result
 
@@ -1,35 +1,44 @@
 import psycopg2
+from psycopg2.extras import execute_batch
 import conn_params
 import pandas as pd
 from sklearn import linear_model, metrics
 from sklearn.model_selection import train_test_split
-import matplotlib.pyplot as plt
 
 
-def linearReg():
+# Connection string for PostgreSQL, all the connection parameters are stored in a separate file "conn_params.py".
+# Also used by flask_test.py.
+conn_string = "host=" + conn_params.HOST \
+              + " port=" + conn_params.PORT \
+              + " dbname=" + conn_params.DATABASE \
+              + " user=" + conn_params.USER \
+              + " password=" + conn_params.PASSWORD
 
-    # Connect to PostgreSQL, all the connection parameters are stored in a separate file "conn_params.py":
-    conn_string = "host=" + conn_params.HOST \
-                  + " port=" + conn_params.PORT \
-                  + " dbname=" + conn_params.DATABASE \
-                  + " user=" + conn_params.USER \
-                  + " password=" + conn_params.PASSWORD
 
-    try:
-        conn = psycopg2.connect(conn_string)
-    except Exception as e:
-        print("There was a problem connecting to the database.")
-        print(e)
+def linearReg(conn=None):
 
-    print("Connected to db!")
+    # Connect to PostgreSQL, unless the caller passed in a connection (e.g. from a pool)
+    own_conn = conn is None
+    if own_conn:
+        try:
+            conn = psycopg2.connect(conn_string)
+        except Exception as e:
+            print("There was a problem connecting to the database.")
+            print(e)
 
-    db_data = pd.read_sql_query('select * from public.heat_demand_info();', conn)
+        print("Connected to db!")
 
-    days = []
-    hours = []
-    for t in db_data["datetime"]:
-        days.append(t.weekday())
-        hours.append(t.hour)
+    # Only fetch the columns the model uses
+    db_data = pd.read_sql_query('select datetime, temperature, heat_demand from public.heat_demand_info();', conn)
+
+    # Extract the calendar features column-wise instead of looping over every timestamp in Python.
+    # Timestamps with mixed UTC offsets (e.g. across a DST change) stay object dtype, so read those one by one.
+    if pd.api.types.is_datetime64_any_dtype(db_data["datetime"]):
+        days = db_data["datetime"].dt.weekday
+        hours = db_data["datetime"].dt.hour
+    else:
+        days = [t.weekday() for t in db_data["datetime"]]
+        hours = [t.hour for t in db_data["datetime"]]
 
     inputs = {'temperature': db_data["temperature"], 'day': days, 'hour': hours}
 
@@ -56,6 +65,8 @@ def linearReg():
     err_test = metrics.mean_squared_error(y_test, y_pred_test)
 
     '''
+    import matplotlib.pyplot as plt
+
     # True values    
     plt.plot(db_data.index, db_data["heat_demand"], label="True Values", color="blue")
 
@@ -67,14 +78,15 @@ def linearReg():
     '''
 
     cur = conn.cursor()
-    # # Add the result in the database
-    for t, r in zip(y_predictions.index, y_predictions):
-        cur.execute("CALL add_heat_demand_prediction(%s, %s);", (db_data["datetime"][t], r))
+    # # Add the result in the database, batching the calls instead of one round trip per row
+    params = zip(db_data["datetime"].loc[y_predictions.index], y_predictions)
+    execute_batch(cur, "CALL add_heat_demand_prediction(%s, %s);", params, page_size=1000)
 
     conn.commit()
 
     cur.close()
-    conn.close()
+    if own_conn:
+        conn.close()
 
     result = ' Done with ml'
     return result
@@ -25,18 +25,21 @@ groups = mask.cumsum()
 # Average the three pressure columns for each row
 df['avg_pressure'] = df[['Shell Start', 'Lower Hydro Start', 'Upper Hydro Start']].mean(axis=1)
 
+# Sum the three minutes columns for each row
+df['test_minutes_sum'] = df[['Shell Minutes', 'Lower Hydro Minutes', 'Upper Hydro Minutes']].sum(axis=1)
+
+# Group the rows once and reuse the grouping for both per-group calculations below
+grouped = df.groupby(groups)
+
 # For each group, calculate the running average
-# Note: We use the transform method to broadcast the result back to the original shape of the DataFrame
-df['running_avg'] = df.groupby(groups)['avg_pressure'].transform(lambda x: (x + x.shift(1)) / 2)
+# Note: The grouped shift stays aligned with the original DataFrame, so no per-group Python function is needed
+df['running_avg'] = (df['avg_pressure'] + grouped['avg_pressure'].shift(1)) / 2
 
 # For rows where num_actuations is 10 or less, replace the running average with the current row's avg_pressure
 df['running_avg'] = df['running_avg'].where(~mask, df['avg_pressure'])
 
-# Sum the three minutes columns for each row
-df['test_minutes_sum'] = df[['Shell Minutes', 'Lower Hydro Minutes', 'Upper Hydro Minutes']].sum(axis=1)
-
 # Calculate the cumulative sum within each group
-df['test_minutes_cum'] = df.groupby(groups)['test_minutes_sum'].cumsum()
+df['test_minutes_cum'] = grouped['test_minutes_sum'].cumsum()
 
 # For rows where num_actuations is 10 or less, replace the cumulative sum with the current row's test_minutes_sum
 df['test_minutes_cum'] = df['test_minutes_cum'].where(~mask, df['test_minutes_sum'])
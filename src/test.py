@@ -16,19 +16,18 @@ def linearReg():
 def simpleFunction():
     print("simpleFunction was called!")  # This function prints directly instead of returning
 
+# Command name -> (function, number of arguments it takes from the command line)
+COMMANDS = {
+    "run-mytest": (myTest, 2),
+    "run-another": (anotherFunction, 2),
+    "run-simple": (simpleFunction, 0),
+    "linearReg": (linearReg, 0),
+}
+
 if __name__ == "__main__":
     command = sys.argv[1]
-    if command == "run-mytest":
-        param1 = sys.argv[2]
-        param2 = sys.argv[3]
-        result = myTest(param1, param2)
-        print(result)
-    elif command == "run-another":
-        param1 = sys.argv[2]
-        param2 = sys.argv[3]
-        result = anotherFunction(param1, param2)
-        print(result)
-    elif command == "run-simple":
-        simpleFunction()
-    elif command == "linearReg":
-        linearReg()
+    if command in COMMANDS:
+        func, num_params = COMMANDS[command]
+        result = func(*sys.argv[2:2 + num_params])
+        if result is not None:  # Some functions print directly instead of returning
+            print(result)